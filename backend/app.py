@@ -7,6 +7,7 @@ from routes.object_route import object_bp
 from routes.profile_route import profile_bp
 from routes.translation_route import translation_bp
 from routes.speech import bp as speech_bp
+from routes.detection import bp as detection_bp
 
 app = Flask(__name__)
 CORS(app, resources={
@@ -24,6 +25,7 @@ app.register_blueprint(object_bp)  # Remove url_prefix to match the frontend req
 app.register_blueprint(profile_bp, url_prefix='/api')
 app.register_blueprint(translation_bp, url_prefix='/api')
 app.register_blueprint(speech_bp, url_prefix='/api')  # Add speech blueprint with /api prefix
+app.register_blueprint(detection_bp, url_prefix='/api/detection')  # Pluggable detector backends
 
 if __name__ == '__main__':
     app.run(debug=True, port=5000)
@@ -0,0 +1,73 @@
+"""Latency and agreement of the frame detector backends over a folder of images.
+
+Every image goes through each backend; detections are matched against the
+reference backend (same label, IoU >= 0.5) to get recall, and the fastest
+backend whose mean recall meets ``--min-recall`` is reported.
+
+Run from the backend directory:
+    python -m benchmarks.detector_benchmark path/to/frames --reference faster_rcnn --min-recall 0.8
+"""
+import argparse
+import os
+
+import cv2
+
+from benchmarks.stats import percentile
+from services.detector_service import DETECTOR_BACKENDS, DetectorService
+
+
+def mean(values):
+    values = [v for v in values if v is not None]
+    return sum(values) / len(values) if values else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('images', help='directory of frames (jpg/png)')
+    parser.add_argument('--backends', nargs='+', default=sorted(DETECTOR_BACKENDS), choices=sorted(DETECTOR_BACKENDS))
+    parser.add_argument('--reference', default='faster_rcnn', choices=sorted(DETECTOR_BACKENDS))
+    parser.add_argument('--min-recall', type=float, default=0.8)
+    args = parser.parse_args()
+
+    paths = sorted(
+        os.path.join(args.images, name) for name in os.listdir(args.images)
+        if name.lower().endswith(('.jpg', '.jpeg', '.png'))
+    )
+    if not paths:
+        parser.error(f"no images found in {args.images}")
+
+    service = DetectorService()
+    latencies = {name: [] for name in set(args.backends) | {args.reference}}
+    recalls = {name: [] for name in latencies}
+    precisions = {name: [] for name in latencies}
+
+    for path in paths:
+        frame = cv2.imread(path)
+        if frame is None:
+            continue
+        comparison = service.compare(frame, args.backends, args.reference)
+        for name, result in comparison["results"].items():
+            latencies[name].append(result["latency_ms"])
+            recalls[name].append(result["agreement"]["recall"])
+            precisions[name].append(result["agreement"]["precision"])
+
+    print(f"reference: {args.reference}, images: {len(paths)}")
+    print(f"{'backend':<14}{'p50 ms':>10}{'p99 ms':>10}{'recall':>10}{'precision':>11}")
+    candidates = []
+    for name in sorted(latencies):
+        p50, p99 = percentile(latencies[name], 50), percentile(latencies[name], 99)
+        recall, precision = mean(recalls[name]), mean(precisions[name])
+        print(f"{name:<14}{p50:>10.1f}{p99:>10.1f}"
+              f"{recall if recall is not None else float('nan'):>10.2f}"
+              f"{precision if precision is not None else float('nan'):>11.2f}")
+        if name != args.reference and recall is not None and recall >= args.min_recall:
+            candidates.append((p50, name))
+
+    if candidates:
+        print(f"\nfastest backend with recall >= {args.min_recall}: {min(candidates)[1]}")
+    else:
+        print(f"\nno backend reaches recall {args.min_recall}; keep {args.reference}")
+
+
+if __name__ == '__main__':
+    main()
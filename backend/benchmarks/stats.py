@@ -0,0 +1,5 @@
+def percentile(values, q):
+    """Nearest-rank percentile of ``values`` (q in 0-100)."""
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(q / 100 * (len(values) - 1))))
+    return values[index]
@@ -0,0 +1,146 @@
+"""Mixed-workload latency with and without the shared thread budget.
+
+Runs the four models concurrently and reports p50/p99 per model, first with the
+scheduler disabled and every library sized to all cores, then with it enabled.
+By default it uses stand-ins (torch conv/linear stacks for ResNet34, Faster R-CNN
+and mBART, OpenCV filtering for the SSD MobileNet path); ``--services`` calls the
+real CurrencyService, PersonService, ObjectService and TranslationService instead,
+which needs their model weights.
+
+Run from the backend directory:
+    python -m benchmarks.thread_budget_benchmark --requests 40 --clients 8
+    python -m benchmarks.thread_budget_benchmark --services --requests 10 --clients 4
+"""
+import argparse
+import random
+import threading
+import time
+
+import cv2
+import numpy as np
+import torch
+
+from benchmarks.stats import percentile
+from utils.thread_budget import thread_scheduler
+
+
+def build_workloads():
+    conv_small = torch.nn.Sequential(*[torch.nn.Conv2d(32, 32, 3, padding=1) for _ in range(4)]).eval()
+    conv_large = torch.nn.Sequential(*[torch.nn.Conv2d(64, 64, 3, padding=1) for _ in range(6)]).eval()
+    linear = torch.nn.Sequential(*[torch.nn.Linear(1024, 1024) for _ in range(12)]).eval()
+
+    small_input = torch.randn(1, 32, 112, 112)
+    large_input = torch.randn(1, 64, 160, 160)
+    tokens = torch.randn(16, 1024)
+    image = np.random.randint(0, 255, (720, 1280, 3), dtype=np.uint8)
+
+    # The real services wrap their own model calls; the stand-ins do it here
+    def currency():
+        with thread_scheduler.budget('currency'), torch.no_grad():
+            conv_small(small_input)
+
+    def person():
+        with thread_scheduler.budget('person'), torch.no_grad():
+            conv_large(large_input)
+
+    def translation():
+        with thread_scheduler.budget('translation'), torch.no_grad():
+            # mBART decodes token by token, so run the stack a few times
+            for _ in range(8):
+                linear(tokens)
+
+    def object_():
+        with thread_scheduler.budget('object'):
+            blurred = cv2.GaussianBlur(image, (31, 31), 0)
+            cv2.resize(blurred, (320, 320))
+
+    return {
+        'currency': currency,
+        'person': person,
+        'translation': translation,
+        'object': object_,
+    }
+
+
+def build_service_workloads():
+    from PIL import Image
+    from services.currency_service import CurrencyService
+    from services.object_service import ObjectService
+    from services.person_service import PersonService
+    from services.translation_service import TranslationService
+
+    currency_service = CurrencyService()
+    object_service = ObjectService()
+    person_service = PersonService()
+    translation_service = TranslationService()
+
+    frame = np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8)
+    image = Image.fromarray(frame[:, :, ::-1])
+    text = "Two people in front of you, the nearest one is two meters away."
+
+    return {
+        'currency': lambda: currency_service.detect_currency(image),
+        'person': lambda: person_service.detect_persons(frame),
+        'translation': lambda: translation_service.translate(text, "en_XX", "te_IN"),
+        'object': lambda: object_service.detect_objects(frame),
+    }
+
+
+def run(workloads, requests, clients, seed):
+    names = list(workloads)
+    rng = random.Random(seed)
+    plan = [rng.choice(names) for _ in range(requests * clients)]
+    latencies = {name: [] for name in names}
+    lock = threading.Lock()
+
+    def client(jobs):
+        for name in jobs:
+            start = time.perf_counter()
+            workloads[name]()
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                latencies[name].append(elapsed)
+
+    threads = [threading.Thread(target=client, args=(plan[i::clients],)) for i in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return latencies
+
+
+def report(title, latencies):
+    print(f"\n{title}")
+    print(f"{'model':<12}{'n':>6}{'p50 ms':>10}{'p99 ms':>10}")
+    everything = []
+    for name, values in latencies.items():
+        everything.extend(values)
+        if values:
+            print(f"{name:<12}{len(values):>6}{percentile(values, 50):>10.1f}{percentile(values, 99):>10.1f}")
+    print(f"{'all':<12}{len(everything):>6}{percentile(everything, 50):>10.1f}{percentile(everything, 99):>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=20, help='requests per client')
+    parser.add_argument('--clients', type=int, default=8, help='concurrent client threads')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--services', action='store_true', help='run the real services instead of stand-ins')
+    args = parser.parse_args()
+
+    workloads = build_service_workloads() if args.services else build_workloads()
+
+    # Baseline: scheduler off, every library uses all cores for every call
+    thread_scheduler.enabled = False
+    torch.set_num_threads(thread_scheduler.total_threads)
+    cv2.setNumThreads(thread_scheduler.total_threads)
+    for fn in workloads.values():
+        fn()  # warm up
+    report('Without thread budget', run(workloads, args.requests, args.clients, args.seed))
+
+    thread_scheduler.enabled = True
+    report('With thread budget', run(workloads, args.requests, args.clients, args.seed))
+
+
+if __name__ == '__main__':
+    main()
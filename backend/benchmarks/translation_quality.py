@@ -0,0 +1,106 @@
+"""Quality and latency of the optimized translation mode against the fp32 baseline.
+
+Translates a small fixed set of announcement-style sentences into all six
+languages with both services and scores the optimized output with chrF, using
+the baseline output as the reference. It also prints the largest observed
+generated/input token ratio of the baseline per language and how many optimized
+outputs hit their length budget (counting the tokens actually generated), to
+tune CVA_TRANSLATION_LENGTH_RATIO.
+
+Run from the backend directory:
+    python -m benchmarks.translation_quality --beams 1 --prune-vocab
+"""
+import argparse
+import time
+from collections import Counter
+
+from services.translation_service import LANGUAGE_CODES, TranslationService
+
+SENTENCES = [
+    "Person ahead.",
+    "Chair on your left.",
+    "Car approaching on the right, about five meters away.",
+    "This is a 500 rupee note.",
+    "No currency detected, please hold the note closer to the camera.",
+    "Two people in front of you, the nearest one is two meters away.",
+    "There is a bottle and a cup on the table in the center.",
+    "Stairs ahead, please walk carefully.",
+]
+
+
+def chrf(hypothesis, reference, max_order=6, beta=2):
+    """Sentence-level chrF (character n-gram F-score, whitespace removed), 0-100."""
+    hyp, ref = hypothesis.replace(' ', ''), reference.replace(' ', '')
+    precisions, recalls = [], []
+    for n in range(1, max_order + 1):
+        hyp_ngrams = Counter(hyp[i:i + n] for i in range(len(hyp) - n + 1))
+        ref_ngrams = Counter(ref[i:i + n] for i in range(len(ref) - n + 1))
+        if not hyp_ngrams or not ref_ngrams:
+            continue
+        overlap = sum((hyp_ngrams & ref_ngrams).values())
+        precisions.append(overlap / sum(hyp_ngrams.values()))
+        recalls.append(overlap / sum(ref_ngrams.values()))
+    if not precisions:
+        return 100.0 if hyp == ref else 0.0
+
+    precision, recall = sum(precisions) / len(precisions), sum(recalls) / len(recalls)
+    if precision + recall == 0:
+        return 0.0
+    return 100 * (1 + beta ** 2) * precision * recall / (beta ** 2 * precision + recall)
+
+
+def run(service, sentences, tgt_lang):
+    outputs, latencies, lengths = [], [], []
+    for sentence in sentences:
+        start = time.perf_counter()
+        result = service.translate(sentence, "en_XX", tgt_lang, return_length=True)
+        latencies.append((time.perf_counter() - start) * 1000)
+        outputs.append(result.get("translation", ""))
+        lengths.append((result.get("input_tokens", 1), result.get("new_tokens", 0)))
+    return outputs, latencies, lengths
+
+
+def length_stats(service, lengths):
+    """Largest generated/input token ratio, and outputs that used up max_new_tokens."""
+    max_ratio, truncated = 0.0, 0
+    for input_length, new_tokens in lengths:
+        max_ratio = max(max_ratio, new_tokens / input_length)
+        if new_tokens >= service.max_new_tokens(input_length):
+            truncated += 1
+    return max_ratio, truncated
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--beams', type=int, default=1)
+    parser.add_argument('--prune-vocab', action='store_true')
+    parser.add_argument('--length-ratio', type=float, default=None, help='default: CVA_TRANSLATION_LENGTH_RATIO or 3.0')
+    parser.add_argument('--min-chrf', type=float, default=80.0, help='fail below this mean chrF')
+    args = parser.parse_args()
+
+    baseline = TranslationService(optimized=False)
+    optimized = TranslationService(optimized=True, num_beams=args.beams, prune_vocab=args.prune_vocab,
+                                   length_ratio=args.length_ratio)
+
+    print(f"length ratio: {optimized.length_ratio}")
+    print(f"{'language':<10}{'baseline ms':>13}{'optimized ms':>14}{'chrF':>8}{'max ratio':>11}{'truncated':>11}")
+    scores = []
+    for tgt_lang in LANGUAGE_CODES.values():
+        reference, baseline_ms, baseline_lengths = run(baseline, SENTENCES, tgt_lang)
+        hypothesis, optimized_ms, optimized_lengths = run(optimized, SENTENCES, tgt_lang)
+        score = sum(chrf(h, r) for h, r in zip(hypothesis, reference)) / len(SENTENCES)
+        scores.append(score)
+        max_ratio, _ = length_stats(baseline, baseline_lengths)
+        _, truncated = length_stats(optimized, optimized_lengths)
+        print(f"{tgt_lang:<10}{sum(baseline_ms) / len(baseline_ms):>13.0f}"
+              f"{sum(optimized_ms) / len(optimized_ms):>14.0f}{score:>8.1f}"
+              f"{max_ratio:>11.2f}{truncated:>11}")
+
+    mean_score = sum(scores) / len(scores)
+    print(f"\nmean chrF vs baseline: {mean_score:.1f} (bar {args.min_chrf})")
+    if mean_score < args.min_chrf:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
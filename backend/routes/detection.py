@@ -2,77 +2,60 @@ from flask import Blueprint, request, jsonify
 import cv2
 import numpy as np
 import base64
-from ..models.currency_detector import CurrencyDetector
-from ..utils.distance import calculate_distance
-from ultralytics import YOLO
-from PIL import Image
-import io
+from services.detector_service import DetectorService, DETECTOR_BACKENDS
 
 bp = Blueprint('detection', __name__)
-yolo_model = YOLO("yolov8n.pt")
-currency_detector = CurrencyDetector()
+detector_service = DetectorService()
+
+def decode_frame(data):
+    image_data = data['frame'].split(',')[1]
+    image_bytes = base64.b64decode(image_data)
+    
+    nparr = np.frombuffer(image_bytes, np.uint8)
+    return cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+
+def unknown_backends(names):
+    return [name for name in names if name not in DETECTOR_BACKENDS]
+
+@bp.route('/backends', methods=['GET'])
+def backends():
+    return jsonify(detector_service.available_backends())
 
 @bp.route('/detect_frame', methods=['POST'])
 def detect_frame():
     try:
         data = request.json
-        image_data = data['frame'].split(',')[1]
-        image_bytes = base64.b64decode(image_data)
-        
-        nparr = np.frombuffer(image_bytes, np.uint8)
-        frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+        backend = data.get('backend')
+        if backend and unknown_backends([backend]):
+            return jsonify({"error": f"Unknown detector backend '{backend}'"}), 400
         
-        results = yolo_model(frame)
-        
-        persons = []
-        for result in results:
-            boxes = result.boxes
-            for box in boxes:
-                if box.cls == 0:  # Person class in YOLO
-                    x1, y1, x2, y2 = map(int, box.xyxy[0].tolist())
-                    height = y2 - y1
-                    distance = calculate_distance(height)
-                    confidence = float(box.conf[0])
-                    
-                    frame_width = frame.shape[1]
-                    center_x = (x1 + x2) / 2
-                    if center_x < frame_width/3:
-                        position = "left"
-                    elif center_x < 2*frame_width/3:
-                        position = "center"
-                    else:
-                        position = "right"
-                        
-                    persons.append({
-                        "distance": f"{distance:.1f}m",
-                        "confidence": confidence,
-                        "position": position
-                    })
-        
-        return jsonify({
-            "persons": persons,
-            "frame_height": frame.shape[0],
-            "frame_width": frame.shape[1]
-        })
+        frame = decode_frame(data)
+        result = detector_service.detect(frame, backend)
+        return jsonify(result)
         
     except Exception as e:
         print(f"Error in detect_frame: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
-@bp.route('/detect_currency', methods=['POST'])
-def detect_currency():
+@bp.route('/compare', methods=['POST'])
+def compare():
     try:
-        if 'image' not in request.files:
-            return jsonify({"error": "No image provided"}), 400
-            
-        file = request.files['image']
-        image_bytes = file.read()
-        image = Image.open(io.BytesIO(image_bytes))
+        data = request.json
+        backends = data.get('backends')
+        reference = data.get('reference')
+        if backends is not None and not (isinstance(backends, list) and all(isinstance(name, str) for name in backends)):
+            return jsonify({"error": "'backends' must be a list of backend names"}), 400
+        if reference is not None and not isinstance(reference, str):
+            return jsonify({"error": "'reference' must be a backend name"}), 400
         
-        currency_value = currency_detector.detect(image)
+        unknown = unknown_backends((backends or []) + ([reference] if reference else []))
+        if unknown:
+            return jsonify({"error": f"Unknown detector backends: {', '.join(unknown)}"}), 400
         
-        return jsonify({"currency_value": currency_value})
+        frame = decode_frame(data)
+        result = detector_service.compare(frame, backends, reference)
+        return jsonify(result)
         
     except Exception as e:
-        print(f"Error in detect_currency: {str(e)}")
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        print(f"Error in compare: {str(e)}")
+        return jsonify({"error": str(e)}), 500
@@ -3,6 +3,7 @@ import cv2
 import numpy as np
 import base64
 from services.object_service import ObjectService
+from services.detector_service import DETECTOR_BACKENDS
 
 object_bp = Blueprint('object', __name__)
 object_service = ObjectService()
@@ -14,13 +15,17 @@ def detect_frame():
         
     try:
         data = request.json
+        backend = data.get('backend')
+        if backend and backend not in DETECTOR_BACKENDS:
+            return jsonify({"error": f"Unknown detector backend '{backend}'"}), 400
+        
         image_data = data['frame'].split(',')[1]
         image_bytes = base64.b64decode(image_data)
         
         nparr = np.frombuffer(image_bytes, np.uint8)
         frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
         
-        result = object_service.detect_objects(frame)
+        result = object_service.detect_objects(frame, backend)
         return jsonify(result)
         
     except Exception as e:
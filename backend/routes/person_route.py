@@ -4,6 +4,7 @@ import cv2
 import numpy as np
 import base64
 from services.person_service import PersonService
+from utils.thread_budget import thread_scheduler
 
 person_bp = Blueprint('person', __name__)
 person_service = PersonService()
@@ -48,7 +49,7 @@ def model_status():
     try:
         # Check if models are loaded and ready
         is_ready = person_service.is_model_ready()
-        return jsonify({"ready": is_ready})
+        return jsonify({"ready": is_ready, "threads": thread_scheduler.stats()})
     except Exception as e:
         print(f"Error checking model status: {str(e)}")
         return jsonify({"ready": False, "error": str(e)}), 500
@@ -1,6 +1,6 @@
 
 from flask import Blueprint, request, jsonify
-from services.translation_service import TranslationService
+from services.translation_service import TranslationService, LANGUAGE_CODES
 
 translation_bp = Blueprint('translation', __name__)
 translation_service = TranslationService()
@@ -12,17 +12,8 @@ def translate():
         text = data.get('text')
         
         # Map frontend language codes to mBART language codes
-        language_map = {
-            'en': 'en_XX',  # English
-            'hi': 'hi_IN',  # Hindi
-            'te': 'te_IN',  # Telugu
-            'ja': 'ja_XX',  # Japanese
-            'zh': 'zh_CN',  # Chinese
-            'es': 'es_XX'   # Spanish
-        }
-        
-        target_lang = language_map.get(data.get('target_lang', 'en'), 'en_XX')
-        source_lang = language_map.get(data.get('source_lang', 'en'), 'en_XX')
+        target_lang = LANGUAGE_CODES.get(data.get('target_lang', 'en'), 'en_XX')
+        source_lang = LANGUAGE_CODES.get(data.get('source_lang', 'en'), 'en_XX')
 
         if not text:
             return jsonify({"error": "No text provided"}), 400
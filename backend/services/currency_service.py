@@ -1,5 +1,6 @@
 from PIL import Image
 from src.inference.inference import Inference
+from utils.thread_budget import thread_scheduler
 import os
 
 class CurrencyService:
@@ -13,7 +14,8 @@ class CurrencyService:
             if image.mode != 'RGB':
                 image = image.convert('RGB')
                 
-            self.model.run_image(image, show=False)
+            with thread_scheduler.budget('currency'):
+                self.model.run_image(image, show=False)
             result = self.model.return_result()
             return result
         except Exception as e:
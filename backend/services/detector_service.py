@@ -0,0 +1,320 @@
+import importlib.util
+import os
+import threading
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+from utils.distance import calculate_distance, calculate_object_distance, get_position
+from utils.thread_budget import thread_scheduler
+
+DATASET_DIR = Path(__file__).parent.parent / 'src/dataset'
+MODELS_DIR = Path(__file__).parent.parent / 'src/models'
+
+# Backend used when a request doesn't name one
+DEFAULT_BACKEND = os.environ.get('CVA_DETECTOR_BACKEND', 'ssd')
+
+
+def load_class_names():
+    # 90 COCO category names, indexed by (category id - 1)
+    with open(DATASET_DIR / 'coco.names', 'rt') as f:
+        return f.read().rstrip('\n').split('\n')
+
+
+def load_average_sizes():
+    average_sizes = {}
+    with open(DATASET_DIR / 'average_sizes.txt', 'rt') as f:
+        for line in f:
+            obj, size = line.strip().split(',')
+            average_sizes[obj.strip()] = float(size.strip())
+    return average_sizes
+
+
+def box_iou(a, b):
+    x1, y1 = max(a[0], b[0]), max(a[1], b[1])
+    x2, y2 = min(a[2], b[2]), min(a[3], b[3])
+    inter = max(0, x2 - x1) * max(0, y2 - y1)
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+class Detector:
+    """Common interface for the frame detectors.
+
+    Backends only implement ``predict``, returning ``(label, confidence, [x1, y1, x2, y2])``
+    tuples; ``detect`` turns them into the result schema shared by every backend.
+    """
+
+    name = None
+    budget_name = None  # thread_scheduler budget the backend draws from
+
+    def __init__(self):
+        self.classNames = load_class_names()
+        self.average_sizes = load_average_sizes()
+        self.warmed_up = False
+
+    def predict(self, frame):
+        raise NotImplementedError
+
+    def estimate_distance(self, label, box):
+        # People by height (more stable than width), everything else by average width
+        if label == 'person':
+            return calculate_distance(max(box[3] - box[1], 1))
+        if label in self.average_sizes:
+            return calculate_object_distance(box[2] - box[0], self.average_sizes[label])
+        return None
+
+    def detect(self, frame):
+        frame_height, frame_width = frame.shape[:2]
+
+        with thread_scheduler.budget(self.budget_name):
+            predictions = self.predict(frame)
+
+        objects = []
+        for label, confidence, box in predictions:
+            distance = self.estimate_distance(label, box)
+            objects.append({
+                "label": label,
+                "confidence": confidence,
+                "position": get_position(frame_width, box),
+                "distance": f"{distance:.1f}m" if distance else None,
+                "box": box
+            })
+
+        return {
+            "objects": objects,
+            "frame_height": frame_height,
+            "frame_width": frame_width,
+            "backend": self.name
+        }
+
+
+class SSDDetector(Detector):
+    """SSD MobileNet v3 through OpenCV DNN."""
+
+    name = 'ssd'
+    budget_name = 'object'
+
+    def __init__(self):
+        super().__init__()
+        self.configPath = str(MODELS_DIR / 'ssd_mobilenet_v3_large_coco_2020_01_14.pbtxt')
+        self.weightsPath = str(MODELS_DIR / 'frozen_inference_graph.pb')
+
+        self.net = cv2.dnn_DetectionModel(self.weightsPath, self.configPath)
+        self.net.setInputSize(320, 320)
+        self.net.setInputScale(1.0 / 127.5)
+        self.net.setInputMean((127.5, 127.5, 127.5))
+        self.net.setInputSwapRB(True)
+
+        self.thres = 0.45
+        self.nms_threshold = 0.2
+
+    def predict(self, frame):
+        classIds, confs, bbox = self.net.detect(frame, confThreshold=self.thres)
+        if len(classIds) == 0:
+            return []
+
+        bbox = list(bbox)
+        confs = list(map(float, np.array(confs).reshape(1, -1)[0]))
+        indices = cv2.dnn.NMSBoxes(bbox, confs, self.thres, self.nms_threshold)
+
+        predictions = []
+        for i in np.array(indices).flatten():
+            x, y, w, h = map(int, bbox[i])
+            label = self.classNames[int(classIds[i]) - 1].lower()
+            predictions.append((label, confs[i], [x, y, x + w, y + h]))
+        return predictions
+
+
+class FasterRCNNDetector(Detector):
+    """torchvision Faster R-CNN ResNet50-FPN (COCO)."""
+
+    name = 'faster_rcnn'
+    budget_name = 'person'
+
+    def __init__(self):
+        super().__init__()
+        import torch
+        from torchvision import transforms
+        from torchvision.models.detection import fasterrcnn_resnet50_fpn
+
+        self.torch = torch
+        self.transform = transforms.ToTensor()
+        self.model = fasterrcnn_resnet50_fpn(pretrained=True)
+        self.model.eval()
+        self.thres = 0.6
+
+    def predict(self, frame):
+        # Frames arrive as BGR from cv2.imdecode; torchvision models expect RGB
+        frame_tensor = self.transform(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)).unsqueeze(0)
+
+        with self.torch.no_grad():
+            output = self.model(frame_tensor)[0]
+
+        boxes = output['boxes'].numpy()
+        labels = output['labels'].numpy()
+        scores = output['scores'].numpy()
+
+        predictions = []
+        for box, class_id, score in zip(boxes, labels, scores):
+            if score <= self.thres:
+                continue
+            label = self.classNames[int(class_id) - 1].lower()
+            predictions.append((label, float(score), box.astype(int).tolist()))
+        return predictions
+
+
+class YOLODetector(Detector):
+    """Ultralytics YOLOv8n on CPU, optionally through its ONNX export.
+
+    The ONNX variant runs on onnxruntime, which sizes its own intra-op pool to all
+    cores and ignores the torch/OpenCV thread counts, so ``yolo_onnx`` is not held
+    to the shared thread budget (it is still counted as in flight while it runs).
+    """
+
+    name = 'yolo'
+    budget_name = 'yolo'
+
+    def __init__(self, onnx=False):
+        super().__init__()
+        from ultralytics import YOLO
+
+        weights = os.environ.get('CVA_YOLO_WEIGHTS', 'yolov8n.pt')
+        if onnx:
+            self.name = 'yolo_onnx'
+            onnx_path = os.path.splitext(weights)[0] + '.onnx'
+            if not os.path.exists(onnx_path):
+                onnx_path = YOLO(weights).export(format='onnx')
+            weights = onnx_path
+
+        self.model = YOLO(weights)
+        self.thres = 0.45
+        # Ultralytics predictors are not thread-safe
+        self._predict_lock = threading.Lock()
+
+    def predict(self, frame):
+        with self._predict_lock:
+            results = self.model(frame, conf=self.thres, device='cpu', verbose=False)
+
+        predictions = []
+        for result in results:
+            for box in result.boxes:
+                label = result.names[int(box.cls[0])].lower()
+                x1, y1, x2, y2 = map(int, box.xyxy[0].tolist())
+                predictions.append((label, float(box.conf[0]), [x1, y1, x2, y2]))
+        return predictions
+
+
+DETECTOR_BACKENDS = {
+    'ssd': SSDDetector,
+    'faster_rcnn': FasterRCNNDetector,
+    'yolo': YOLODetector,
+}
+# The ONNX export and inference need onnx and onnxruntime (optional dependencies)
+if importlib.util.find_spec('onnx') and importlib.util.find_spec('onnxruntime'):
+    DETECTOR_BACKENDS['yolo_onnx'] = lambda: YOLODetector(onnx=True)
+
+_detectors = {}
+_detector_locks = {name: threading.Lock() for name in DETECTOR_BACKENDS}
+
+
+def get_detector(name=None):
+    """Return the (lazily loaded, shared) detector for ``name``."""
+    name = name or DEFAULT_BACKEND
+    if name not in DETECTOR_BACKENDS:
+        raise ValueError(f"Unknown detector backend '{name}', expected one of {sorted(DETECTOR_BACKENDS)}")
+
+    detector = _detectors.get(name)
+    if detector is not None:
+        return detector
+
+    # Only callers waiting on this backend block while it loads
+    with _detector_locks[name]:
+        if name not in _detectors:
+            _detectors[name] = DETECTOR_BACKENDS[name]()
+        return _detectors[name]
+
+
+def warm_up(name, frame):
+    """Run one untimed detect on a freshly loaded backend.
+
+    First calls are slow (ultralytics builds its predictor lazily, torch/oneDNN warm
+    up); the per-backend lock makes sure this happens once even under concurrency.
+    """
+    detector = get_detector(name)
+    if detector.warmed_up:
+        return detector
+
+    with _detector_locks[name]:
+        if not detector.warmed_up:
+            detector.detect(frame)
+            detector.warmed_up = True
+    return detector
+
+
+def agreement(reference, candidate, iou_threshold=0.5):
+    """Greedy same-label IoU matching of ``candidate`` objects against ``reference``."""
+    unmatched = sorted(candidate, key=lambda obj: obj["confidence"], reverse=True)
+    matched = 0
+    for ref in reference:
+        best, best_iou = None, iou_threshold
+        for obj in unmatched:
+            if obj["label"] != ref["label"]:
+                continue
+            iou = box_iou(ref["box"], obj["box"])
+            if iou >= best_iou:
+                best, best_iou = obj, iou
+        if best is not None:
+            unmatched.remove(best)
+            matched += 1
+
+    return {
+        "matched": matched,
+        "recall": matched / len(reference) if reference else None,
+        "precision": matched / len(candidate) if candidate else None
+    }
+
+
+class DetectorService:
+    def available_backends(self):
+        return {
+            "default": DEFAULT_BACKEND,
+            "backends": sorted(DETECTOR_BACKENDS),
+            "loaded": sorted(_detectors.copy())
+        }
+
+    def detect(self, frame, backend=None):
+        return get_detector(backend).detect(frame)
+
+    def compare(self, frame, backends=None, reference=None):
+        """Run ``frame`` through several backends, timing each and scoring it against ``reference``.
+
+        Without an explicit ``backends`` list only the backends that are already loaded
+        are compared, so a request never triggers a model download or ONNX export.
+        """
+        backends = list(backends or sorted(_detectors.copy()))
+        reference = reference or DEFAULT_BACKEND
+        if reference not in backends:
+            backends = [reference] + backends
+
+        # Untimed first call per backend, so cold starts don't count as latency
+        detectors = {name: warm_up(name, frame) for name in backends}
+
+        results = {}
+        for name, detector in detectors.items():
+            start = time.perf_counter()
+            result = detector.detect(frame)
+            result["latency_ms"] = (time.perf_counter() - start) * 1000
+            results[name] = result
+
+        reference_objects = results[reference]["objects"]
+        for name, result in results.items():
+            result["agreement"] = agreement(reference_objects, result["objects"])
+
+        return {
+            "reference": reference,
+            "frame_height": frame.shape[0],
+            "frame_width": frame.shape[1],
+            "results": results
+        }
@@ -1,12 +1,113 @@
 
 from transformers import MBartForConditionalGeneration, MBart50TokenizerFast
 import os
+import torch
+from utils.thread_budget import thread_scheduler
+
+# Frontend language codes -> mBART language codes
+LANGUAGE_CODES = {
+    'en': 'en_XX',  # English
+    'hi': 'hi_IN',  # Hindi
+    'te': 'te_IN',  # Telugu
+    'ja': 'ja_XX',  # Japanese
+    'zh': 'zh_CN',  # Chinese
+    'es': 'es_XX'   # Spanish
+}
+
+# Unicode ranges each language's output can use, for vocabulary pruning
+LATIN = [(0x0000, 0x024F)]
+SCRIPT_RANGES = {
+    'en_XX': LATIN,
+    'es_XX': LATIN,
+    'hi_IN': [(0x0900, 0x097F)],
+    'te_IN': [(0x0C00, 0x0C7F)],
+    'ja_XX': [(0x3000, 0x30FF), (0x3400, 0x4DBF), (0x4E00, 0x9FFF), (0xFF00, 0xFFEF)],
+    'zh_CN': [(0x3000, 0x303F), (0x3400, 0x4DBF), (0x4E00, 0x9FFF), (0xFF00, 0xFFEF)],
+}
+# Digits, punctuation and symbols shared by every language
+COMMON_RANGES = [(0x0000, 0x007F), (0x2000, 0x206F), (0x20A0, 0x20CF)]
+
+
+def _env_number(name, convert, default, valid):
+    """Read a numeric CVA_* setting, falling back to ``default`` on a bad value."""
+    raw = os.environ.get(name)
+    if raw is None:
+        return default
+    try:
+        value = convert(raw)
+    except ValueError:
+        value = None
+    if value is None or not valid(value):
+        print(f"Ignoring invalid {name}: {raw}")
+        return default
+    return value
+
+
+def _token_allowed(token, ranges):
+    text = token.replace('▁', '')  # sentencepiece word-start marker
+    return all(any(lo <= ord(ch) <= hi for lo, hi in ranges) for ch in text)
+
+
+def prune_vocabulary(model, tokenizer, languages):
+    """Shrink the shared embedding and LM head to tokens the given languages can produce.
+
+    Returns ``(kept_ids, old_to_new)``: the original ids that were kept (in order) and a
+    lookup tensor mapping original ids to pruned ids (dropped tokens map to <unk>).
+    """
+    ranges = list(COMMON_RANGES)
+    for lang in languages:
+        ranges.extend(SCRIPT_RANGES.get(lang, []))
+
+    special_ids = set(tokenizer.all_special_ids)
+    vocab = tokenizer.convert_ids_to_tokens(list(range(len(tokenizer))))
+    kept = [i for i, token in enumerate(vocab) if i in special_ids or _token_allowed(token, ranges)]
+    kept_ids = torch.tensor(kept, dtype=torch.long)
+
+    old_to_new = torch.full((len(tokenizer),), kept.index(tokenizer.unk_token_id), dtype=torch.long)
+    old_to_new[kept_ids] = torch.arange(len(kept))
+
+    # <s>, <pad>, </s>, <unk> are ids 0-3 and always kept, so their ids don't move;
+    # only the language codes at the end of the vocabulary are renumbered.
+    weight = torch.nn.Parameter(model.model.shared.weight.data[kept_ids].clone())
+    for embedding in {model.model.shared, model.model.encoder.embed_tokens, model.model.decoder.embed_tokens}:
+        embedding.weight = weight
+        embedding.num_embeddings = len(kept)
+    model.lm_head.weight = weight
+    model.lm_head.out_features = len(kept)
+    model.final_logits_bias = model.final_logits_bias[:, kept_ids]
+    model.config.vocab_size = len(kept)
+
+    return kept_ids, old_to_new
+
 
 class TranslationService:
-    def __init__(self):
+    def __init__(self, optimized=None, num_beams=None, prune_vocab=None, length_ratio=None):
         self.model_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'models', 'mbart_model')
         self.model = None
         self.tokenizer = None
+        self.max_length = 128
+
+        # Optimized CPU mode: int8 dynamic quantization, greedy/small-beam decoding with the
+        # KV cache and a length-aware token budget. Configurable per deployment via CVA_* vars.
+        if optimized is None:
+            optimized = os.environ.get('CVA_TRANSLATION_MODE', 'baseline') == 'optimized'
+        if num_beams is None:
+            num_beams = _env_number('CVA_TRANSLATION_BEAMS', int, 1, lambda v: v >= 1)
+        elif num_beams < 1:
+            raise ValueError(f"num_beams must be at least 1, got {num_beams}")
+        if prune_vocab is None:
+            prune_vocab = os.environ.get('CVA_TRANSLATION_PRUNE_VOCAB', '0') == '1'
+        if length_ratio is None:
+            length_ratio = _env_number('CVA_TRANSLATION_LENGTH_RATIO', float, 3.0, lambda v: v > 0)
+        elif length_ratio <= 0:
+            raise ValueError(f"length_ratio must be positive, got {length_ratio}")
+        self.optimized = optimized
+        self.num_beams = num_beams
+        self.prune_vocab = optimized and prune_vocab
+        self.length_ratio = length_ratio
+        self.kept_ids = None
+        self.old_to_new = None
+
         self.load_model()
 
     def load_model(self):
@@ -20,26 +121,68 @@ class TranslationService:
             else:
                 self.model = MBartForConditionalGeneration.from_pretrained(self.model_dir)
                 self.tokenizer = MBart50TokenizerFast.from_pretrained(self.model_dir)
+
+            self.model.eval()
+            if self.optimized:
+                self.optimize_model()
         except Exception as e:
             print(f"Error loading model: {str(e)}")
             raise
 
-    def translate(self, text, src_lang="en_XX", tgt_lang="te_IN"):
+    def optimize_model(self):
+        if self.prune_vocab:
+            # Must happen before quantization, which packs the LM head weights
+            self.kept_ids, self.old_to_new = prune_vocabulary(
+                self.model, self.tokenizer, LANGUAGE_CODES.values()
+            )
+        torch.quantization.quantize_dynamic(self.model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+    def max_new_tokens(self, input_length):
+        # mBART-50 splits Telugu/Hindi into much finer pieces than English, so the output
+        # budget is input tokens * length_ratio. The default of 3.0 is a conservative guess;
+        # benchmarks/translation_quality.py prints the observed per-language ratios and
+        # truncations to tune CVA_TRANSLATION_LENGTH_RATIO against.
+        return min(self.max_length, int(self.length_ratio * input_length) + 10)
+
+    def translate(self, text, src_lang="en_XX", tgt_lang="te_IN", return_length=False):
         if not text or not isinstance(text, str):
             return {"error": "Invalid input text"}
-            
+
         try:
-            encoded_text = self.tokenizer(text, return_tensors="pt", padding=True, truncation=True)
+            # src_lang decides the language token the tokenizer prepends, so set it first
             self.tokenizer.src_lang = src_lang
+            encoded_text = self.tokenizer(text, return_tensors="pt", padding=True, truncation=True)
             forced_bos_token_id = self.tokenizer.lang_code_to_id[tgt_lang]
-            
-            generated_tokens = self.model.generate(
-                **encoded_text, 
-                forced_bos_token_id=forced_bos_token_id,
-                max_length=128
-            )
-            
+
+            if self.optimized:
+                generation_args = {
+                    "num_beams": self.num_beams,
+                    "use_cache": True,
+                    "max_new_tokens": self.max_new_tokens(encoded_text["input_ids"].shape[1])
+                }
+                if self.old_to_new is not None:
+                    encoded_text["input_ids"] = self.old_to_new[encoded_text["input_ids"]]
+                    forced_bos_token_id = int(self.old_to_new[forced_bos_token_id])
+            else:
+                generation_args = {"max_length": self.max_length}
+
+            with thread_scheduler.budget('translation'):
+                generated_tokens = self.model.generate(
+                    **encoded_text,
+                    forced_bos_token_id=forced_bos_token_id,
+                    **generation_args
+                )
+
+            if self.kept_ids is not None:
+                generated_tokens = self.kept_ids[generated_tokens]
+
             translation = self.tokenizer.batch_decode(generated_tokens, skip_special_tokens=True)
-            return {"translation": translation[0]}
+            result = {"translation": translation[0]}
+            if return_length:
+                # Tokens actually generated (after the decoder start token), comparable with
+                # max_new_tokens; re-tokenizing the text undercounts with a pruned vocabulary
+                result["input_tokens"] = encoded_text["input_ids"].shape[1]
+                result["new_tokens"] = generated_tokens.shape[1] - 1
+            return result
         except Exception as e:
             return {"error": f"Translation failed: {str(e)}"}
@@ -5,4 +5,19 @@ def calculate_distance(height: float) -> float:
     
     # Calculate distance using triangle similarity
     distance = (KNOWN_HEIGHT * FOCAL_LENGTH) / height
-    return distance
\ No newline at end of file
+    return distance
+
+def calculate_object_distance(object_width: float, real_width: float, focal_length: float = 615) -> float:
+    # Same triangle similarity, using the object's average real-world width
+    return (real_width * focal_length) / (object_width + 1e-6)
+
+
+def get_position(frame_width: int, box) -> str:
+    # box is [x1, y1, x2, y2]; position is taken from the horizontal centre
+    center_x = (box[0] + box[2]) / 2
+    if center_x < frame_width / 3:
+        return "left"
+    elif center_x < 2 * frame_width / 3:
+        return "center"
+    else:
+        return "right"
@@ -0,0 +1,146 @@
+import os
+import threading
+from contextlib import contextmanager
+
+import cv2
+import torch
+
+# Relative weight of each model when splitting the CPU between concurrent requests.
+# Heavier models (Faster R-CNN, mBART) get a larger share than the light ones.
+DEFAULT_WEIGHTS = {
+    'currency': 1.0,     # ResNet34
+    'object': 1.0,       # SSD MobileNet (OpenCV DNN)
+    'person': 2.0,       # Faster R-CNN
+    'translation': 2.0,  # mBART
+    'yolo': 1.0,         # YOLOv8n detector backend
+}
+
+
+def _parse_mapping(value: str, convert) -> dict:
+    """Parse 'name=value,name=value' strings from the environment, skipping bad entries."""
+    mapping = {}
+    if not value:
+        return mapping
+    for item in value.split(','):
+        if '=' not in item:
+            continue
+        name, raw = item.split('=', 1)
+        try:
+            mapping[name.strip()] = convert(raw.strip())
+        except ValueError:
+            print(f"Ignoring malformed thread budget entry: {item.strip()}")
+    return mapping
+
+
+class ThreadScheduler:
+    """Shares a fixed CPU thread budget between the PyTorch and OpenCV models.
+
+    Every inference call runs inside ``budget(model)``, which gives the call its
+    model's share of ``total_threads``: the model's weight over the summed weights
+    of all calls in flight, capped by the model's fixed budget if it has one.
+
+    torch's count is set with ``torch.set_num_threads`` in the calling thread on
+    entry. Its OpenMP count is per thread, so the oneDNN kernels of that call get the
+    model's own budget; the MKL count it also writes is process-wide and follows the
+    most recently started call. The request thread keeps that count afterwards,
+    which is harmless because every model call sets its own on entry.
+    ``cv2.setNumThreads`` is process-wide, so OpenCV gets one aggregate count: total
+    threads over calls in flight, never more than the largest per-model budget among
+    them. It goes back to its startup value when idle.
+
+    Budgets are fixed when a call starts. A call that is already running keeps the
+    torch count it started with, so a heavy request that started on an idle machine
+    still uses every core until it finishes; later calls only get smaller shares.
+
+    Pinning models to core sets is not supported: the worker pools that run the
+    inference are created once per process and don't follow the request thread's
+    affinity, so pinning needs a separate process per model group.
+    """
+
+    def __init__(self, total_threads=None, weights=None, fixed=None, min_threads=1, enabled=True):
+        self.total_threads = total_threads or os.cpu_count() or 1
+        self.weights = dict(DEFAULT_WEIGHTS)
+        self.weights.update(weights or {})
+        self.fixed = dict(fixed or {})        # model -> thread cap, applies to that model only
+        self.min_threads = min_threads
+        self.enabled = enabled
+
+        self._lock = threading.Lock()
+        self._active = {}                     # model -> number of in-flight calls
+        self._idle_cv2 = cv2.getNumThreads()
+        self._cv2_threads = None              # process-wide OpenCV count while busy
+
+    @classmethod
+    def from_env(cls):
+        """Build the scheduler from CVA_* environment variables.
+
+        CVA_THREAD_SCHEDULER  set to 0 to disable the scheduler
+        CVA_TOTAL_THREADS     total intra-op threads to hand out (default: all cores)
+        CVA_THREAD_WEIGHTS    e.g. "person=3,translation=2"
+        CVA_THREAD_BUDGETS    per-model caps, e.g. "object=2,currency=1"
+        """
+        total = None
+        try:
+            total = int(os.environ.get('CVA_TOTAL_THREADS') or 0) or None
+        except ValueError:
+            print(f"Ignoring malformed CVA_TOTAL_THREADS: {os.environ.get('CVA_TOTAL_THREADS')}")
+        weights = _parse_mapping(os.environ.get('CVA_THREAD_WEIGHTS', ''), float)
+        fixed = _parse_mapping(os.environ.get('CVA_THREAD_BUDGETS', ''), int)
+        enabled = os.environ.get('CVA_THREAD_SCHEDULER', '1') != '0'
+        return cls(total_threads=total, weights=weights, fixed=fixed, enabled=enabled)
+
+    def _threads_for(self, model: str) -> int:
+        # Caller holds _lock; counts every in-flight call, including this one
+        total_weight = sum(self.weights.get(name, 1.0) * count for name, count in self._active.items())
+        share = self.weights.get(model, 1.0) / max(total_weight, 1e-6)
+        threads = int(self.total_threads * share)
+        if model in self.fixed:
+            threads = min(threads, self.fixed[model])
+        return max(self.min_threads, threads)
+
+    def _apply_cv2(self):
+        # Caller holds _lock; OpenCV's count is process-wide, so it follows the aggregate
+        in_flight = sum(self._active.values())
+        if in_flight == 0:
+            self._cv2_threads = None
+            cv2.setNumThreads(self._idle_cv2)
+            return
+
+        largest = max(self._threads_for(name) for name, count in self._active.items() if count > 0)
+        self._cv2_threads = max(self.min_threads, min(self.total_threads // in_flight, largest))
+        cv2.setNumThreads(self._cv2_threads)
+
+    def stats(self) -> dict:
+        with self._lock:
+            active = {name: count for name, count in self._active.items() if count > 0}
+            return {
+                "enabled": self.enabled,
+                "total_threads": self.total_threads,
+                "active": active,
+                "budgets": {name: self._threads_for(name) for name in active},
+                "cv2_threads": self._cv2_threads if self._cv2_threads is not None else self._idle_cv2,
+            }
+
+    @contextmanager
+    def budget(self, model: str):
+        """Run the enclosed inference with ``model``'s share of the thread budget."""
+        if not self.enabled:
+            yield None
+            return
+
+        with self._lock:
+            self._active[model] = self._active.get(model, 0) + 1
+            threads = self._threads_for(model)
+            self._apply_cv2()
+
+        torch.set_num_threads(threads)
+        try:
+            yield threads
+        finally:
+            with self._lock:
+                self._active[model] -= 1
+                self._apply_cv2()
+
+
+# Shared by every service so all models draw from the same budget
+thread_scheduler = ThreadScheduler.from_env()